@@ -7,22 +7,27 @@ GitHub:
 - mathsteps: https://github.com/google/mathsteps
 """
 
+import sys
+from types import MappingProxyType
+
+_SEP = "=" * 70
+
 # ============================================================================
 # ANIMATION SETTINGS
 # ============================================================================
 
-ANIMATION_CONFIG = {
+ANIMATION_CONFIG = MappingProxyType({
     'pixel_height': 1080,
     'pixel_width': 1920,
     'frame_rate': 60,
     'background_color': '#1a1a2e',  # Dark background
-}
+})
 
 # ============================================================================
 # COLOR SCHEME (Professional & Modern)
 # ============================================================================
 
-COLORS = {
+COLORS = MappingProxyType({
     'title': '#4A90E2',           # Professional blue
     'equation': '#FFFFFF',        # White
     'description': '#F5A623',     # Warm orange
@@ -32,13 +37,13 @@ COLORS = {
     'background': '#1a1a2e',      # Dark navy
     'step_bg': '#2C3E50',         # Dark blue-gray
     'accent': '#9B59B6',          # Purple accent
-}
+})
 
 # ============================================================================
 # TYPOGRAPHY SETTINGS
 # ============================================================================
 
-FONT_SIZES = {
+FONT_SIZES = MappingProxyType({
     'title': 52,
     'subtitle': 38,
     'equation': 44,
@@ -46,13 +51,13 @@ FONT_SIZES = {
     'step_indicator': 20,
     'label': 18,
     'small': 16,
-}
+})
 
 # ============================================================================
 # ANIMATION TIMING (in seconds)
 # ============================================================================
 
-TIMING = {
+TIMING = MappingProxyType({
     'title_intro': 1.2,
     'title_underline': 1.2,
     'subtitle_fade': 0.8,
@@ -71,30 +76,30 @@ TIMING = {
     'wait_step': 1.5,
     'wait_end': 2.0,
     'error_display': 3.0,
-}
+})
 
 # ============================================================================
 # MATH STEPPER SETTINGS
 # ============================================================================
 
-MATH_STEPPER = {
+MATH_STEPPER = MappingProxyType({
     'timeout': 10,  # Seconds to wait for Node.js process
     'js_file': 'math_stepper.js',
     'retry_on_failure': True,
     'max_retries': 2,
-}
+})
 
 # ============================================================================
 # OUTPUT SETTINGS
 # ============================================================================
 
-OUTPUT = {
+OUTPUT = MappingProxyType({
     'default_quality': 'l',  # 'l' = low, 'm' = medium, 'h' = high, 'k' = 4k
     'default_format': 'mp4',
     'output_dir': './media/videos/',
     'save_last_frame': False,
     'transparent_background': False,
-}
+})
 
 QUALITY_PRESETS = {
     'l': {'resolution': '480p', 'fps': 15, 'description': 'Low - Fast preview'},
@@ -107,7 +112,7 @@ QUALITY_PRESETS = {
 # BEHAVIOR SETTINGS
 # ============================================================================
 
-BEHAVIOR = {
+BEHAVIOR = MappingProxyType({
     'show_step_numbers': True,
     'show_progress_bar': True,
     'show_substeps': False,
@@ -115,13 +120,13 @@ BEHAVIOR = {
     'verbose_logging': True,
     'validate_input': True,
     'strict_mode': False,  # Fail on warnings if True
-}
+})
 
 # ============================================================================
 # UI/UX SETTINGS
 # ============================================================================
 
-UI = {
+UI = MappingProxyType({
     'use_rounded_corners': True,
     'corner_radius': 0.1,
     'box_padding': 0.3,
@@ -129,7 +134,7 @@ UI = {
     'glow_effect': True,
     'celebration_effects': True,
     'show_error_suggestions': True,
-}
+})
 
 # ============================================================================
 # PRESETS
@@ -209,66 +214,92 @@ PRESET_MINIMAL = {
     }
 }
 
+# Frozen preset lookup table, built once at import time
+_PRESETS = MappingProxyType({
+    'fast': PRESET_FAST,
+    'presentation': PRESET_PRESENTATION,
+    'educational': PRESET_EDUCATIONAL,
+    'minimal': PRESET_MINIMAL,
+})
+
+# Display order for print_config_info
+_PRESET_TABLE = (
+    ('fast', PRESET_FAST),
+    ('presentation', PRESET_PRESENTATION),
+    ('educational', PRESET_EDUCATIONAL),
+    ('minimal', PRESET_MINIMAL),
+)
+
 
 def get_config(preset: str = None) -> dict:
     """
     Get configuration with optional preset
-    
+
     Args:
         preset: 'fast', 'presentation', 'educational', or 'minimal'
-        
+
     Returns:
-        Configuration dictionary
+        Configuration dictionary. Sections not touched by the preset are
+        read-only MappingProxyType views of the defaults; use
+        get_mutable_config() if you need to modify sections in place.
     """
+    # Share the frozen section proxies directly; only sections touched by a
+    # preset are materialized as real dicts (copy-on-write)
     config = {
-        'animation': ANIMATION_CONFIG.copy(),
-        'colors': COLORS.copy(),
-        'fonts': FONT_SIZES.copy(),
-        'timing': TIMING.copy(),
-        'math_stepper': MATH_STEPPER.copy(),
-        'output': OUTPUT.copy(),
-        'behavior': BEHAVIOR.copy(),
-        'ui': UI.copy(),
+        'animation': ANIMATION_CONFIG,
+        'colors': COLORS,
+        'fonts': FONT_SIZES,
+        'timing': TIMING,
+        'math_stepper': MATH_STEPPER,
+        'output': OUTPUT,
+        'behavior': BEHAVIOR,
+        'ui': UI,
     }
-    
-    # Apply preset if specified
-    presets = {
-        'fast': PRESET_FAST,
-        'presentation': PRESET_PRESENTATION,
-        'educational': PRESET_EDUCATIONAL,
-        'minimal': PRESET_MINIMAL,
-    }
-    
-    if preset and preset.lower() in presets:
-        preset_config = presets[preset.lower()]
-        
-        # Merge preset settings
+
+    if preset is None:
+        return config
+
+    # Apply preset if specified (single lookup, no per-call table rebuild)
+    preset_config = _PRESETS.get(preset.lower())
+    if preset_config:
+        # Merge preset settings into a fresh dict per touched section
         for section, settings in preset_config.items():
             if section in config:
-                config[section].update(settings)
-    
+                config[section] = {**config[section], **settings}
+
     return config
 
 
+def get_mutable_config(preset: str = None) -> dict:
+    """
+    Get configuration with every section as a plain mutable dict
+
+    Args:
+        preset: 'fast', 'presentation', 'educational', or 'minimal'
+
+    Returns:
+        Configuration dictionary safe to modify in place
+    """
+    return {section: dict(settings) for section, settings in get_config(preset).items()}
+
+
 def print_config_info():
     """Print configuration information"""
-    print("\n" + "="*70)
-    print("Math Animation System - Configuration")
-    print("="*70)
-    print("\nAvailable Presets:")
-    for name, preset in [
-        ('fast', PRESET_FAST),
-        ('presentation', PRESET_PRESENTATION),
-        ('educational', PRESET_EDUCATIONAL),
-        ('minimal', PRESET_MINIMAL)
-    ]:
-        print(f"\n  {name.upper()}")
+    lines = [
+        "\n" + _SEP,
+        "Math Animation System - Configuration",
+        _SEP,
+        "\nAvailable Presets:",
+    ]
+    for name, preset in _PRESET_TABLE:
+        lines.append(f"\n  {name.upper()}")
         if 'timing' in preset:
-            print(f"    - Faster animations" if name == 'fast' else "    - Detailed animations")
+            lines.append("    - Faster animations" if name == 'fast' else "    - Detailed animations")
         if 'output' in preset:
-            print(f"    - Quality: {preset['output'].get('default_quality', 'default')}")
-    
-    print("\n" + "="*70)
+            lines.append(f"    - Quality: {preset['output'].get('default_quality', 'default')}")
+
+    lines.append("\n" + _SEP)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == '__main__':
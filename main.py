@@ -15,11 +15,76 @@ License: MIT
 import argparse
 import sys
 import json
+import mmap
+import re
 import subprocess
 import os
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Optional
-from math_bridge import MathStepperBridge
+from typing import Dict, Iterable, List, Optional
+from math_bridge import MathStepperBridge, Step, solve_batch, _TRANSIENT_ERRORS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Manim output directory name per quality level
+_QUALITY_DIR = {'l': '480p15', 'm': '720p30', 'h': '1080p60', 'k': '2160p60'}
+
+# Manim quality preset names for the in-process rendering API
+_QUALITY_NAMES = {
+    'l': 'low_quality',
+    'm': 'medium_quality',
+    'h': 'high_quality',
+    'k': 'fourk_quality',
+}
+
+# Manim CLI flag per (quality, preview) pair, built once at import
+_QUALITY_FLAGS = {
+    (q, preview): f"-p{q}" if preview else f"-{q}"
+    for q in _QUALITY_DIR
+    for preview in (True, False)
+}
+
+# Characters that can plausibly appear in a well-formed math input; used
+# by the cheap local pre-check before spending a Node round-trip
+_QUICK_VALIDATE = re.compile(r'^[\sxX0-9+\-*/^().=\\a-zA-Z{}_,]+$')
+
+
+def quick_validate(equation: str) -> bool:
+    """
+    Cheap local sanity check for math input
+
+    Rejects blatantly malformed input (bad characters, unbalanced
+    brackets) without round-tripping to the Node stepper. A passing
+    input may still fail to parse in mathsteps.
+    """
+    if not equation or not _QUICK_VALIDATE.match(equation):
+        return False
+    parens = braces = 0
+    for ch in equation:
+        if ch == '(':
+            parens += 1
+        elif ch == ')':
+            parens -= 1
+            if parens < 0:
+                return False
+        elif ch == '{':
+            braces += 1
+        elif ch == '}':
+            braces -= 1
+            if braces < 0:
+                return False
+    return parens == 0 and braces == 0
+
+
+# Paths resolved once at import; run_animation would otherwise rebuild
+# (and re-normalize) them with Path arithmetic on every call
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_ANIMATOR_PATH = os.path.join(_SCRIPT_DIR, "enhanced_animator.py")
+_MEDIA_BASE = os.path.join(_SCRIPT_DIR, "media", "videos", "enhanced_animator")
 
 
 class Colors:
@@ -34,18 +99,63 @@ class Colors:
     BOLD = '\033[1m'
 
 
+# Precomputed byte prefixes so the logger never re-encodes constant ANSI
+# codes; unseen combinations (e.g. CYAN + BOLD) are memoized on first use
+_RESET_NL = (Colors.RESET + "\n").encode()
+_COLOR_PREFIXES = {
+    color: color.encode()
+    for color in ("", Colors.GREEN, Colors.RED, Colors.YELLOW, Colors.BLUE,
+                  Colors.MAGENTA, Colors.CYAN, Colors.BOLD)
+}
+
+
+def _jsonable(result: dict) -> dict:
+    """Convert Step records back to plain dicts for JSON output"""
+    steps = result.get('steps')
+    if steps and isinstance(steps[0], Step):
+        return {**result, 'steps': [s._asdict() for s in steps]}
+    return result
+
+
 class MathAnimationPipeline:
     """Orchestrates the complete math visualization pipeline"""
     
     def __init__(self, quiet: bool = False):
         self.bridge = MathStepperBridge()
         self.quiet = quiet
-        self.script_dir = Path(__file__).parent.absolute()
+        self.script_dir = Path(_SCRIPT_DIR)
+        # stat the animator script once; its presence does not change
+        # between animations within one run
+        self._animator_exists = os.path.exists(_ANIMATOR_PATH)
+        self._media_dirs = {
+            q: os.path.join(_MEDIA_BASE, d) for q, d in _QUALITY_DIR.items()
+        }
+        # How many equations the most recent batch_process consumed;
+        # streaming callers have no result dict to count
+        self.last_batch_count = 0
+        # Logging writes raw bytes; push any earlier text-mode output
+        # (banner) down to the byte layer first so ordering is preserved
+        sys.stdout.flush()
     
-    def log(self, message: str, color: str = ""):
-        """Log message if not quiet mode"""
+    def log(self, fmt: str, *args, color: str = ""):
+        """
+        Log message if not quiet mode (buffered; see _flush_log)
+
+        Accepts lazy %-style arguments so no formatting work happens
+        when output is suppressed: log("Step %d: %s", n, desc)
+        """
+        if self.quiet:
+            return
+        prefix = _COLOR_PREFIXES.get(color)
+        if prefix is None:
+            prefix = _COLOR_PREFIXES[color] = color.encode()
+        message = fmt % args if args else fmt
+        sys.stdout.buffer.write(prefix + message.encode() + _RESET_NL)
+
+    def _flush_log(self):
+        """Flush buffered log output (called at step boundaries)"""
         if not self.quiet:
-            print(f"{color}{message}{Colors.RESET}")
+            sys.stdout.buffer.flush()
     
     def process_equation(self, equation: str, verbose: bool = True) -> dict:
         """
@@ -59,40 +169,44 @@ class MathAnimationPipeline:
             Results with steps and metadata
         """
         if verbose:
-            self.log(f"\n{'='*70}", Colors.CYAN)
-            self.log(f"Processing: {equation}", Colors.BOLD)
-            self.log('='*70, Colors.CYAN)
+            self.log(f"\n{'='*70}", color=Colors.CYAN)
+            self.log(f"Processing: {equation}", color=Colors.BOLD)
+            self.log('='*70, color=Colors.CYAN)
         
         result = self.bridge.get_info(equation)
         
         if not result.get('success'):
-            self.log(f"❌ Error: {result.get('error')}", Colors.RED)
+            self.log(f"❌ Error: {result.get('error')}", color=Colors.RED)
             if result.get('suggestion'):
-                self.log(f"💡 Suggestion: {result.get('suggestion')}", Colors.YELLOW)
+                self.log(f"💡 Suggestion: {result.get('suggestion')}", color=Colors.YELLOW)
+            self._flush_log()
             return result
         
         if verbose:
-            self.log(f"✓ Type: {result.get('type')}", Colors.GREEN)
-            self.log(f"✓ Total Steps: {result.get('stepCount')}", Colors.GREEN)
+            self.log(f"✓ Type: {result.get('type')}", color=Colors.GREEN)
+            self.log(f"✓ Total Steps: {result.get('stepCount')}", color=Colors.GREEN)
             
             if result.get('processedInput') != equation:
-                self.log(f"📝 Processed as: {result.get('processedInput')}", Colors.YELLOW)
+                self.log(f"📝 Processed as: {result.get('processedInput')}", color=Colors.YELLOW)
             
             self.log("")
             
             # Print each step
             for step in result.get('steps', []):
-                self.log(f"Step {step['step']}: {step['description']}", Colors.BLUE)
-                self.log(f"  {step['before']}")
-                self.log(f"  ↓", Colors.YELLOW)
-                self.log(f"  {step['after']}", Colors.GREEN)
-                if step.get('hasSubsteps'):
-                    self.log(f"  [Substeps: {step['substepCount']}]", Colors.MAGENTA)
+                self.log("Step %s: %s", step.step, step.description, color=Colors.BLUE)
+                self.log("  %s", step.before)
+                self.log("  ↓", color=Colors.YELLOW)
+                self.log("  %s", step.after, color=Colors.GREEN)
+                if step.hasSubsteps:
+                    self.log("  [Substeps: %s]", step.substepCount, color=Colors.MAGENTA)
                 self.log("")
-        
+
+        self._flush_log()
         return result
     
-    def run_animation(self, equation: str, quality: str = 'l', preview: bool = True) -> bool:
+    def run_animation(self, equation: str, quality: str = 'l', preview: bool = True,
+                      strict: bool = False,
+                      prevalidated: Optional[dict] = None):
         """
         Run Manim animation for the equation
         
@@ -100,117 +214,223 @@ class MathAnimationPipeline:
             equation: Math input
             quality: Quality level (l=low, m=medium, h=high, k=4k)
             preview: Whether to open preview after rendering
+            strict: Pre-flight the equation through the stepper instead of
+                the cheap local check
+            prevalidated: An existing process_equation result for this
+                equation; a successful one skips re-validation entirely,
+                a failed one refuses the render outright
             
         Returns:
-            True if successful, False otherwise
+            Path of the rendered video on success (True if the render
+            succeeded but the output file could not be located), False
+            otherwise. Both success values are truthy, so boolean
+            checks keep working; callers that want the file use the
+            returned path instead of rescanning the media tree.
         """
-        self.log(f"\n🎬 Creating animation for: {equation}", Colors.CYAN + Colors.BOLD)
+        self.log(f"\n🎬 Creating animation for: {equation}", color=Colors.CYAN + Colors.BOLD)
         
-        # First validate the equation
-        result = self.process_equation(equation, verbose=False)
-        if not result.get('success'):
-            self.log(f"❌ Cannot create animation: {result.get('error')}", Colors.RED)
+        # Validate cheaply before spending a Node round-trip; the animator
+        # itself fails loudly on inputs mathsteps cannot handle. A caller
+        # that already solved the equation passes its result through so we
+        # never hit the stepper twice for one CLI invocation — and a
+        # failed solve means there is nothing worth rendering.
+        if prevalidated is not None:
+            if not prevalidated.get('success'):
+                self.log(f"❌ Cannot create animation: {prevalidated.get('error')}", color=Colors.RED)
+                return False
+        elif strict:
+            result = self.process_equation(equation, verbose=False)
+            if not result.get('success'):
+                self.log(f"❌ Cannot create animation: {result.get('error')}", color=Colors.RED)
+                return False
+        elif not quick_validate(equation):
+            self.log("❌ Cannot create animation: input looks malformed", color=Colors.RED)
             return False
         
         # Build Manim command
-        animator_path = self.script_dir / "enhanced_animator.py"
-        
-        if not animator_path.exists():
-            self.log(f"❌ Animator script not found: {animator_path}", Colors.RED)
+        if not self._animator_exists:
+            self.log(f"❌ Animator script not found: {_ANIMATOR_PATH}", color=Colors.RED)
             return False
         
-        # Quality flags
-        quality_flag = f"-p{quality}" if preview else f"-{quality}"
+        # Quality flags (precomputed table; see _QUALITY_FLAGS)
+        quality_flag = _QUALITY_FLAGS[(quality, preview)]
         
         cmd = [
             "manim",
             quality_flag,
-            str(animator_path),
+            _ANIMATOR_PATH,
             "MathStepsAnimator",
             "--",
             "--equation",
             equation
         ]
         
-        self.log(f"🔧 Running: {' '.join(cmd[:4])} ... --equation \"{equation}\"", Colors.BLUE)
-        self.log("⏳ This may take a moment...\n", Colors.YELLOW)
-        
+        if not self.quiet:
+            # Guarded at the call site: the join is not worth building
+            # just for log() to throw it away in quiet mode
+            self.log(f"🔧 Running: {' '.join(cmd[:4])} ... --equation \"{equation}\"", color=Colors.BLUE)
+            self.log("⏳ This may take a moment...\n", color=Colors.YELLOW)
+        self._flush_log()
+
         try:
             # Run Manim
+            # Capture as bytes; stderr is only decoded on the failure path
             result = subprocess.run(
                 cmd,
-                cwd=str(self.script_dir),
+                cwd=_SCRIPT_DIR,
                 capture_output=not preview,  # Show output if previewing
-                text=True
             )
             
             if result.returncode == 0:
-                self.log(f"\n✅ Animation created successfully!", Colors.GREEN + Colors.BOLD)
-                
-                # Find the output video
-                media_dir = self.script_dir / "media" / "videos" / "enhanced_animator" / (
-                    "1080p60" if quality == 'h' else 
-                    "2160p60" if quality == 'k' else
-                    "480p15" if quality == 'l' else
-                    "720p30"
-                )
-                
-                if media_dir.exists():
-                    videos = list(media_dir.glob("*.mp4"))
-                    if videos:
-                        latest_video = max(videos, key=lambda p: p.stat().st_mtime)
-                        self.log(f"📹 Video saved to: {latest_video}", Colors.CYAN)
+                self.log(f"\n✅ Animation created successfully!", color=Colors.GREEN + Colors.BOLD)
                 
+                # Find the output video in a single scandir pass (DirEntry
+                # caches the stat result from the directory listing)
+                media_dir = self._media_dirs.get(quality, self._media_dirs['m'])
+
+                if os.path.isdir(media_dir):
+                    latest_video, latest_mtime = None, -1
+                    with os.scandir(media_dir) as it:
+                        for entry in it:
+                            if entry.name.endswith('.mp4'):
+                                mtime = entry.stat().st_mtime
+                                if mtime > latest_mtime:
+                                    latest_mtime, latest_video = mtime, entry.path
+                    if latest_video:
+                        self.log(f"📹 Video saved to: {latest_video}", color=Colors.CYAN)
+                        return Path(latest_video)
+
                 return True
             else:
-                self.log(f"❌ Animation failed with error code: {result.returncode}", Colors.RED)
+                self.log(f"❌ Animation failed with error code: {result.returncode}", color=Colors.RED)
                 if result.stderr:
-                    self.log(f"Error output: {result.stderr}", Colors.RED)
+                    self.log("Error output: %s",
+                             result.stderr.decode('utf-8', 'replace'), color=Colors.RED)
                 return False
                 
         except FileNotFoundError:
-            self.log("❌ Manim not found! Please install it:", Colors.RED)
-            self.log("   pip install manim", Colors.YELLOW)
+            self.log("❌ Manim not found! Please install it:", color=Colors.RED)
+            self.log("   pip install manim", color=Colors.YELLOW)
             return False
         except Exception as e:
-            self.log(f"❌ Unexpected error: {str(e)}", Colors.RED)
+            self.log(f"❌ Unexpected error: {str(e)}", color=Colors.RED)
             return False
     
-    def batch_process(self, equations: List[str]) -> Dict[str, dict]:
+    def render_inprocess(self, equation: str, quality: str = 'l'):
+        """
+        Render the animation in-process via the Manim Python API
+
+        Importing manim once per process and calling Scene.render()
+        directly skips the interpreter + import cold start (roughly a
+        second or two) the CLI subprocess pays on every run. Falls back
+        to run_animation on any failure.
+
+        Args:
+            equation: Math input
+            quality: Quality level (l=low, m=medium, h=high, k=4k)
+
+        Returns:
+            Path of the rendered video, or the run_animation fallback's
+            result on error
+        """
+        try:
+            from manim import tempconfig
+            from enhanced_animator import MathStepsAnimator
+
+            with tempconfig({
+                'quality': _QUALITY_NAMES.get(quality, 'low_quality'),
+                'preview': False,
+            }):
+                scene = MathStepsAnimator(equation=equation)
+                scene.render()
+                return Path(scene.renderer.file_writer.movie_file_path)
+        except Exception as e:
+            self.log("⚠ In-process render failed (%s); falling back to the manim CLI",
+                     e, color=Colors.YELLOW)
+            self._flush_log()
+            return self.run_animation(equation, quality=quality, preview=False)
+
+    def batch_process(self, equations: Iterable[str], chunk_size: int = 256,
+                      results_sink: Optional[Path] = None) -> Dict[str, dict]:
         """
         Process multiple equations
-        
+
         Args:
-            equations: List of math inputs
-            
+            equations: Math inputs; any iterable, consumed lazily in chunks
+            chunk_size: How many equations to solve per worker-pool batch
+            results_sink: If given, stream each result to this file as a
+                JSONL line instead of accumulating them in memory; the
+                returned dictionary is then empty. Keeps the heap O(1)
+                in the batch size.
+
         Returns:
-            Dictionary with results for all equations
+            Dictionary with results for all equations (empty when
+            streaming; last_batch_count carries the processed count)
         """
         results = {}
+        sink = None
+        if results_sink is not None:
+            results_sink = Path(results_sink)
+            results_sink.parent.mkdir(parents=True, exist_ok=True)
+            sink = open(results_sink, 'wb')
         success_count = 0
         error_count = 0
-        
-        self.log(f"\n📦 Batch Processing {len(equations)} equations...\n", Colors.CYAN + Colors.BOLD)
-        
-        for i, eq in enumerate(equations, 1):
-            self.log(f"[{i}/{len(equations)}]", Colors.BLUE)
-            result = self.process_equation(eq)
-            results[eq] = result
-            
-            if result.get('success'):
-                success_count += 1
-            else:
-                error_count += 1
-        
+        total = len(equations) if hasattr(equations, '__len__') else None
+
+        count_label = f"{total} " if total else ""
+        self.log(f"\n📦 Batch Processing {count_label}equations...\n", color=Colors.CYAN + Colors.BOLD)
+
+        # Consume the input in bounded chunks: fan each chunk out across
+        # the multiplexed worker pool, then replay the now-cached results
+        # in order for logging
+        equations = iter(equations)
+        i = 0
+        while True:
+            chunk = list(islice(equations, chunk_size))
+            if not chunk:
+                break
+
+            if len(chunk) > 1:
+                # Seed the replay cache, but never with transport
+                # failures: a one-off timeout must not make an equation
+                # permanently fail for the rest of the process
+                for eq, result in zip(chunk, solve_batch(chunk)):
+                    if (isinstance(eq, str)
+                            and result.get('error') not in _TRANSIENT_ERRORS):
+                        self.bridge._cache.setdefault(eq.strip(), result)
+
+            for eq in chunk:
+                i += 1
+                self.log(f"[{i}/{total}]" if total else f"[{i}]", color=Colors.BLUE)
+                result = self.process_equation(eq)
+                if sink is not None:
+                    row = {eq: _jsonable(result)}
+                    if orjson is not None:
+                        sink.write(orjson.dumps(row) + b'\n')
+                    else:
+                        sink.write(json.dumps(row).encode() + b'\n')
+                else:
+                    results[eq] = result
+
+                if result.get('success'):
+                    success_count += 1
+                else:
+                    error_count += 1
+
         # Summary
-        self.log(f"\n{'='*70}", Colors.CYAN)
-        self.log("BATCH SUMMARY", Colors.BOLD)
-        self.log('='*70, Colors.CYAN)
-        self.log(f"Total Processed: {len(equations)}")
-        self.log(f"✓ Successful: {success_count}", Colors.GREEN)
-        self.log(f"✗ Errors: {error_count}", Colors.RED)
-        self.log('='*70, Colors.CYAN)
-        
+        self.log(f"\n{'='*70}", color=Colors.CYAN)
+        self.log("BATCH SUMMARY", color=Colors.BOLD)
+        self.log('='*70, color=Colors.CYAN)
+        self.log(f"Total Processed: {i}")
+        self.log(f"✓ Successful: {success_count}", color=Colors.GREEN)
+        self.log(f"✗ Errors: {error_count}", color=Colors.RED)
+        self.log('='*70, color=Colors.CYAN)
+        if sink is not None:
+            sink.close()
+            self.log(f"\n💾 Results streamed to: {results_sink}", color=Colors.GREEN)
+        self._flush_log()
+
+        self.last_batch_count = i
         return results
     
     def save_results(self, results: dict, output_file: str):
@@ -219,16 +439,43 @@ class MathAnimationPipeline:
         
         # Ensure parent directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        results = {eq: _jsonable(result) for eq, result in results.items()}
         
-        with open(output_path, 'w') as f:
-            json.dump(results, f, indent=2)
+        if orjson is not None:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, 'w') as f:
+                json.dump(results, f, indent=2)
         
-        self.log(f"\n💾 Results saved to: {output_path}", Colors.GREEN)
+        self.log(f"\n💾 Results saved to: {output_path}", color=Colors.GREEN)
+        self._flush_log()
 
 
-def print_banner():
-    """Print application banner"""
-    banner = f"""
+def iter_equations(file_path: Path) -> Iterable[str]:
+    """
+    Yield equations from a file lazily
+
+    The file is mmap'ed so the OS page cache backs the scan and no
+    intermediate list of lines is materialized; blank lines and
+    '#'-comments are skipped.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for raw in iter(mm.readline, b''):
+                stripped = raw.strip()
+                if stripped and not stripped.startswith(b'#'):
+                    yield stripped.decode('utf-8', 'replace')
+        finally:
+            mm.close()
+
+
+# Banner rendered to bytes once at import; print_banner only writes it
+_BANNER_BYTES = f"""
 {Colors.CYAN}{'='*70}
 {Colors.BOLD}  Math Animation System - Step-by-Step Solver & Animator
 {Colors.CYAN}{'='*70}{Colors.RESET}
@@ -238,8 +485,13 @@ def print_banner():
     - https://github.com/ManimCommunity/manim
     - https://github.com/google/mathsteps
 {Colors.CYAN}{'='*70}{Colors.RESET}
-"""
-    print(banner)
+""".encode() + b'\n'
+
+
+def print_banner():
+    """Print application banner"""
+    sys.stdout.buffer.write(_BANNER_BYTES)
+    sys.stdout.buffer.flush()
 
 
 def main():
@@ -313,6 +565,12 @@ def main():
         action='store_true',
         help='Do not open preview after rendering'
     )
+
+    parser.add_argument(
+        '--strict',
+        action='store_true',
+        help='Fully validate input through the math stepper before animating'
+    )
     
     parser.add_argument(
         '--save',
@@ -340,6 +598,7 @@ def main():
     
     pipeline = MathAnimationPipeline(quiet=args.quiet)
     results = {}
+    streamed = False
     
     # Process equation(s)
     if args.equation:
@@ -351,7 +610,9 @@ def main():
             success = pipeline.run_animation(
                 args.equation,
                 quality=args.quality,
-                preview=not args.no_preview
+                preview=not args.no_preview,
+                strict=args.strict,
+                prevalidated=result
             )
             if not success:
                 sys.exit(1)
@@ -362,22 +623,27 @@ def main():
             print(f"{Colors.RED}❌ File not found: {args.file}{Colors.RESET}")
             sys.exit(1)
         
-        # Read equations from file
-        with open(file_path, 'r') as f:
-            equations = [line.strip() for line in f if line.strip() and not line.startswith('#')]
-        
-        if not equations:
-            print(f"{Colors.RED}❌ No equations found in: {args.file}{Colors.RESET}")
-            sys.exit(1)
-        
+        # Stream equations from the file without materializing a list
+        equations = iter_equations(file_path)
+
         if args.batch:
-            results = pipeline.batch_process(equations)
+            if args.save:
+                # Stream results straight to the save file as JSONL so
+                # large batches never hold every step tree in memory
+                pipeline.batch_process(equations, results_sink=Path(args.save))
+                streamed = True
+            else:
+                results = pipeline.batch_process(equations)
         else:
             for eq in equations:
                 results[eq] = pipeline.process_equation(eq)
+
+        if not results and (not streamed or pipeline.last_batch_count == 0):
+            print(f"{Colors.RED}❌ No equations found in: {args.file}{Colors.RESET}")
+            sys.exit(1)
     
-    # Save results if requested
-    if args.save:
+    # Save results if requested (batch mode already streamed them above)
+    if args.save and not streamed:
         pipeline.save_results(results, args.save)
     
     return 0
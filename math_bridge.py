@@ -1,17 +1,65 @@
 """
 Python bridge to connect with the math stepper JavaScript module.
-Executes the JS math stepper and parses results for use in animations.
+Keeps a persistent Node.js worker running the JS math stepper and
+parses its results for use in animations.
 """
 
 import json
+import os
+import select
+import selectors
 import subprocess
 import sys
+import threading
+from collections import namedtuple
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson parses with a SIMD tokenizer and is several times faster than the
+# stdlib decoder; fall back transparently when it is not installed
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Refuse to parse pathological stepper outputs; parsing a blob this big
+# would roughly double its footprint while the tree is built
+_MAX_OUTPUT_BYTES = 32 * 1024 * 1024
+
+# Transport-level failures (as opposed to mathsteps rejecting the input)
+# may well succeed on retry, so they must never be cached as an input's
+# permanent answer
+_TRANSIENT_ERRORS = frozenset({
+    'Math stepper process timed out',
+    'Math stepper worker exited unexpectedly',
+})
+
+# Compact per-step record built once at parse time: attribute access is
+# cheaper than dict lookups in the print/animation loops, and dropping
+# each step's hash table shrinks cached results severalfold
+Step = namedtuple('Step', ['step', 'description', 'before', 'after',
+                           'changeType', 'hasSubsteps', 'substepCount'])
+
+
+def _make_steps(raw_steps: List[Dict[str, Any]]) -> List[Step]:
+    """Convert the stepper's per-step JSON objects into Step records"""
+    return [
+        Step(d.get('step'), d.get('description'), d.get('before'),
+             d.get('after'), d.get('changeType'),
+             d.get('hasSubsteps', False), d.get('substepCount', 0))
+        for d in raw_steps
+    ]
+
 class MathStepperBridge:
     """Bridge between Python and JavaScript math stepper"""
-    
+
+    # First reply waits out Node + mathsteps cold start; once the worker
+    # has answered, equations should resolve well within the warm budget
+    _COLD_TIMEOUT = 20
+    _WARM_TIMEOUT = 5
+
     def __init__(self, js_file: str = None):
         """
         Initialize the bridge with path to JS stepper
@@ -27,7 +75,118 @@ class MathStepperBridge:
         self.js_file = Path(js_file)
         if not self.js_file.exists():
             raise FileNotFoundError(f"Math stepper JS file not found: {js_file}")
-    
+        self._js_file_str = str(self.js_file)  # avoid per-spawn str() calls
+        self._argv = ['node', self._js_file_str, '--serve']
+
+        # Spawn the worker with a minimal environment; copying the full
+        # parent environ (large under Manim/CI) adds avoidable exec cost
+        self._env = {'PATH': os.environ.get('PATH', '')}
+        node_options = os.environ.get('NODE_OPTIONS')
+        if node_options:
+            self._env['NODE_OPTIONS'] = node_options
+
+        # Results are deterministic per input, so repeated equations
+        # (batch runs, re-instantiated scenes) skip the Node round-trip
+        self._cache: Dict[str, Dict[str, Any]] = {}
+
+        # Persistent Node worker, started lazily on first use; amortizes
+        # the ~100ms Node/mathsteps startup over all calls
+        self._proc: Optional[subprocess.Popen] = None
+        self._cold = True    # no reply received from this worker yet
+        self._stale = 0      # replies still owed by timed-out requests
+        self._rbuf = bytearray()  # replies read off the pipe, not yet consumed
+
+        # The worker speaks a strictly ordered line protocol, so callers
+        # on different threads (the bot's executor pool) must not
+        # interleave their request/reply pairs
+        self._lock = threading.Lock()
+
+    def _ensure_worker(self) -> subprocess.Popen:
+        """Start (or restart) the persistent Node worker process"""
+        if self._proc is None or self._proc.poll() is not None:
+            self._cold = True
+            self._stale = 0
+            del self._rbuf[:]  # drop leftovers from a previous worker
+            self._proc = subprocess.Popen(
+                self._argv,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                close_fds=False,  # lets Popen use posix_spawn, skipping fork+VM copy
+                env=self._env,
+            )
+        return self._proc
+
+    def close(self):
+        """Terminate the persistent Node worker, if running"""
+        if self._proc is not None:
+            try:
+                self._proc.stdin.close()
+                self._proc.terminate()
+            except OSError:
+                pass
+            self._proc = None
+
+    def __del__(self):
+        self.close()
+
+    def _read_reply(self, proc: subprocess.Popen,
+                    timeout: float) -> Optional[bytes]:
+        """Read one reply line from the worker's stdout
+
+        The pipe is read at the fd level into the bridge's own buffer:
+        one read can deliver several coalesced replies, and select() on
+        the fd cannot see data a buffered stream has already consumed,
+        so the stream layer is bypassed entirely. Returns the line
+        (with newline), b'' on worker EOF, or None on timeout.
+        """
+        nl = self._rbuf.find(b'\n')
+        while nl < 0:
+            ready, _, _ = select.select([proc.stdout], [], [], timeout)
+            if not ready:
+                return None
+            chunk = os.read(proc.stdout.fileno(), 65536)
+            if not chunk:
+                return b''
+            self._rbuf += chunk
+            nl = self._rbuf.find(b'\n')
+        line = bytes(self._rbuf[:nl + 1])
+        del self._rbuf[:nl + 1]
+        return line
+
+    def _request(self, input_string: str, timeout: float = None) -> bytes:
+        """Send one input line to the worker and read one JSON line back"""
+        proc = self._ensure_worker()
+
+        # A previous request may have timed out with its reply still in
+        # flight. Drain any late replies now so the line protocol stays
+        # aligned; if the worker still owes one, it is wedged — restart.
+        while self._stale:
+            if not self._read_reply(proc, 0):
+                self.close()
+                proc = self._ensure_worker()
+                break
+            self._stale -= 1
+
+        if timeout is None:
+            timeout = self._COLD_TIMEOUT if self._cold else self._WARM_TIMEOUT
+
+        proc.stdin.write(input_string.replace('\n', ' ').encode() + b'\n')
+        proc.stdin.flush()
+
+        line = self._read_reply(proc, timeout)
+        if line is None:
+            # Keep the (warm) worker alive; the owed reply is drained on
+            # the next request instead of paying a Node cold start now
+            self._stale += 1
+            raise subprocess.TimeoutExpired('node', timeout)
+        if not line:
+            stderr = (proc.stderr.read() or b'').decode('utf-8', 'replace')
+            self.close()
+            raise RuntimeError(stderr.strip() or 'Math stepper worker exited unexpectedly')
+        self._cold = False
+        return line
+
     def process_input(self, input_string: str) -> Dict[str, Any]:
         """
         Process math input (equation or expression) through math stepper
@@ -44,41 +203,57 @@ class MathStepperBridge:
                 'error': 'Input must be a non-empty string',
                 'input': input_string
             }
-        
+
+        cache_key = input_string.strip()
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            # Execute Node.js script with input
-            result = subprocess.run(
-                ['node', str(self.js_file), input_string],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
+            # Round-trip through the persistent Node worker; if it died
+            # since the last call, restart it and retry once. The lock
+            # keeps concurrent callers' request/reply pairs ordered.
+            with self._lock:
+                try:
+                    line = self._request(input_string)
+                except BrokenPipeError:
+                    self.close()
+                    line = self._request(input_string)
+
+            if len(line) > _MAX_OUTPUT_BYTES:
                 return {
                     'success': False,
-                    'error': result.stderr or 'Unknown error from math stepper',
+                    'error': f'Math stepper output too large ({len(line)} bytes)',
                     'input': input_string
                 }
-            
-            # Parse JSON output
+
+            # Parse JSON output (cached; transient failures below are not)
             try:
-                output = json.loads(result.stdout)
+                output = _loads(line)
+                if output.get('steps'):
+                    output['steps'] = _make_steps(output['steps'])
+                self._cache[cache_key] = output
                 return output
-            except json.JSONDecodeError as e:
+            except ValueError as e:
                 return {
                     'success': False,
                     'error': f'Invalid JSON output from math stepper: {e}',
                     'input': input_string,
-                    'raw_output': result.stdout
+                    'raw_output': line.decode('utf-8', 'replace')
                 }
-                
+
         except subprocess.TimeoutExpired:
             return {
                 'success': False,
                 'error': 'Math stepper process timed out',
                 'input': input_string
             }
+        except RuntimeError as e:
+            return {
+                'success': False,
+                'error': str(e) or 'Unknown error from math stepper',
+                'input': input_string
+            }
         except Exception as e:
             return {
                 'success': False,
@@ -95,6 +270,216 @@ class MathStepperBridge:
         """Get full result information"""
         return self.process_input(input_string)
 
+    def get_info_batch(self, equations: List[str]) -> List[Dict[str, Any]]:
+        """
+        Solve many inputs through the worker in one pipelined pass
+
+        All uncached inputs are written to the worker up front and the
+        replies are read back in order, so the worker solves equation
+        N+1 while Python parses equation N — one flush and no
+        per-equation round-trip. Invalid and cached inputs are answered
+        locally and never sent.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(equations)
+        pending = []
+        for i, eq in enumerate(equations):
+            if not eq or not isinstance(eq, str):
+                results[i] = {
+                    'success': False,
+                    'error': 'Input must be a non-empty string',
+                    'input': eq
+                }
+            else:
+                cached = self._cache.get(eq.strip())
+                if cached is not None:
+                    results[i] = cached
+                else:
+                    pending.append(i)
+        if not pending:
+            return results
+
+        payload = b''.join(
+            equations[i].replace('\n', ' ').encode() + b'\n' for i in pending
+        )
+        with self._lock:
+            proc = self._ensure_worker()
+            try:
+                proc.stdin.write(payload)
+                proc.stdin.flush()
+            except BrokenPipeError:
+                self.close()
+                proc = self._ensure_worker()
+                proc.stdin.write(payload)
+                proc.stdin.flush()
+
+            for n, i in enumerate(pending):
+                timeout = self._COLD_TIMEOUT if self._cold else self._WARM_TIMEOUT
+                line = self._read_reply(proc, timeout)
+                if not line:
+                    # Timed out or worker died; the stream is no longer
+                    # aligned with the remaining inputs, so stop here
+                    self.close()
+                    error = ('Math stepper process timed out' if line is None
+                             else 'Math stepper worker exited unexpectedly')
+                    for j in pending[n:]:
+                        results[j] = {
+                            'success': False,
+                            'error': error,
+                            'input': equations[j]
+                        }
+                    break
+                self._cold = False
+                if len(line) > _MAX_OUTPUT_BYTES:
+                    results[i] = {
+                        'success': False,
+                        'error': f'Math stepper output too large ({len(line)} bytes)',
+                        'input': equations[i]
+                    }
+                    continue
+                try:
+                    output = _loads(line)
+                    if output.get('steps'):
+                        output['steps'] = _make_steps(output['steps'])
+                    self._cache[equations[i].strip()] = output
+                    results[i] = output
+                except ValueError as e:
+                    results[i] = {
+                        'success': False,
+                        'error': f'Invalid JSON output from math stepper: {e}',
+                        'input': equations[i],
+                        'raw_output': line.decode('utf-8', 'replace')
+                    }
+        return results
+
+
+def solve_batch(equations: List[str], max_workers: int = None,
+                timeout: float = 10) -> List[Dict[str, Any]]:
+    """
+    Solve many inputs by multiplexing a pool of persistent Node workers
+
+    One selectors loop (epoll on Linux) drives all worker pipes: each
+    worker gets an equation, completions are harvested as they become
+    readable, and the freed worker is immediately fed the next input.
+    Avoids dedicating a blocking read per in-flight equation.
+
+    Args:
+        equations: Math inputs, one result returned per input (in order)
+        max_workers: Worker pool size (defaults to the CPU count)
+        timeout: Seconds to wait for any completion before giving up
+
+    Returns:
+        List of result dictionaries, aligned with the input list
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(equations)
+    pending = []
+    for i, eq in enumerate(equations):
+        if not eq or not isinstance(eq, str):
+            results[i] = {
+                'success': False,
+                'error': 'Input must be a non-empty string',
+                'input': eq
+            }
+        else:
+            pending.append(i)
+    if not pending:
+        return results
+    pending.reverse()  # pop() consumes in submission order
+
+    workers = [
+        MathStepperBridge()
+        for _ in range(min(len(pending), max_workers or os.cpu_count() or 1))
+    ]
+    sel = selectors.DefaultSelector()
+    busy: Dict[int, int] = {}  # worker index -> equation index
+
+    def _feed(worker_index: int) -> None:
+        if pending:
+            i = pending.pop()
+            proc = workers[worker_index]._proc
+            try:
+                proc.stdin.write(equations[i].replace('\n', ' ').encode() + b'\n')
+                proc.stdin.flush()
+            except OSError:
+                # Worker died since its last reply; record the failure
+                # and retire it, mirroring the read side
+                results[i] = {
+                    'success': False,
+                    'error': 'Math stepper worker exited unexpectedly',
+                    'input': equations[i]
+                }
+                sel.unregister(proc.stdout)
+                workers[worker_index].close()
+                return
+            busy[worker_index] = i
+
+    try:
+        for w, bridge in enumerate(workers):
+            proc = bridge._ensure_worker()
+            sel.register(proc.stdout, selectors.EVENT_READ, w)
+            _feed(w)
+
+        while busy:
+            events = sel.select(timeout)
+            if not events:
+                for i in busy.values():
+                    results[i] = {
+                        'success': False,
+                        'error': 'Math stepper process timed out',
+                        'input': equations[i]
+                    }
+                break
+            for key, _ in events:
+                w = key.data
+                if w not in busy:
+                    continue
+                i = busy.pop(w)
+                line = key.fileobj.readline()
+                if not line:
+                    # Worker died; record the failure and retire it
+                    results[i] = {
+                        'success': False,
+                        'error': 'Math stepper worker exited unexpectedly',
+                        'input': equations[i]
+                    }
+                    sel.unregister(key.fileobj)
+                    workers[w].close()
+                    continue
+                if len(line) > _MAX_OUTPUT_BYTES:
+                    results[i] = {
+                        'success': False,
+                        'error': f'Math stepper output too large ({len(line)} bytes)',
+                        'input': equations[i]
+                    }
+                    _feed(w)
+                    continue
+                try:
+                    output = _loads(line)
+                    if output.get('steps'):
+                        output['steps'] = _make_steps(output['steps'])
+                    results[i] = output
+                except ValueError as e:
+                    results[i] = {
+                        'success': False,
+                        'error': f'Invalid JSON output from math stepper: {e}',
+                        'input': equations[i],
+                        'raw_output': line.decode('utf-8', 'replace')
+                    }
+                _feed(w)
+    finally:
+        sel.close()
+        for bridge in workers:
+            bridge.close()
+
+    # Anything still unresolved (e.g. its worker died mid-batch) is an error
+    for i, result in enumerate(results):
+        if result is None:
+            results[i] = {
+                'success': False,
+                'error': 'Math stepper worker exited unexpectedly',
+                'input': equations[i]
+            }
+    return results
+
 
 # Example usage and testing
 if __name__ == '__main__':
@@ -120,7 +505,7 @@ if __name__ == '__main__':
             print(f"Steps: {result.get('stepCount')}\n")
             
             for step in result.get('steps', []):
-                print(f"Step {step['step']}: {step['description']}")
-                print(f"  {step['before']} → {step['after']}")
+                print(f"Step {step.step}: {step.description}")
+                print(f"  {step.before} → {step.after}")
         else:
             print(f"Error: {result.get('error')}")
@@ -197,11 +197,29 @@ function processMathInput(input) {
     }
 }
 
-// Handle both direct function call and command-line execution
+// Handle direct function call, one-shot CLI, and worker modes
 if (require.main === module) {
-    const input = process.argv[2] || '5x+3=0';
-    const result = processMathInput(input);
-    console.log(JSON.stringify(result, null, 2));
+    const arg = process.argv[2];
+    if (arg !== undefined && arg !== '--serve') {
+        // One-shot mode: solve a single input passed on the command line
+        const result = processMathInput(arg);
+        console.log(JSON.stringify(result, null, 2));
+    } else {
+        // Persistent worker mode: read one input per line on stdin and
+        // emit one JSON document per line on stdout. Keeping the process
+        // alive amortizes Node/mathsteps startup over many equations.
+        const readline = require('readline');
+        readline.createInterface({ input: process.stdin, terminal: false })
+            .on('line', (line) => {
+                let result;
+                try {
+                    result = processMathInput(line);
+                } catch (error) {
+                    result = { success: false, error: error.message, input: line };
+                }
+                process.stdout.write(JSON.stringify(result) + '\n');
+            });
+    }
 } else {
     module.exports = { processMathInput, preprocessInput };
 }
@@ -16,9 +16,18 @@ Dependencies:
 """
 
 import os
+import re
 import sys
+import json
+import time
+import shutil
+import hashlib
 import logging
 import asyncio
+import threading
+import concurrent.futures
+from collections import OrderedDict
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
@@ -32,6 +41,7 @@ try:
         ContextTypes,
         filters
     )
+    from telegram.helpers import escape_markdown
 except ImportError:
     print("❌ python-telegram-bot not installed!")
     print("Install it with: pip install python-telegram-bot")
@@ -56,6 +66,34 @@ DONATION_LINKS = {
 
 SOURCE_CODE_URL = 'https://github.com/yourusername/math-animator'
 
+# Resolved once at import; rendered videos land under MEDIA_DIR and the
+# on-disk animation cache lives beside it
+_SCRIPT_DIR = Path(__file__).resolve().parent
+MEDIA_DIR = _SCRIPT_DIR / "media" / "videos" / "enhanced_animator"
+
+# Single compiled scan for "looks like an equation" instead of several
+# substring passes (and a lowercased copy) per inbound message
+EQUATION_HINT_RE = re.compile(r'[=xX]|sqrt', re.IGNORECASE)
+
+
+def _md_escape(text) -> str:
+    """Escape user-supplied text interpolated into Markdown replies
+
+    Inputs like `x_1` or a stray `*` make Telegram's parser reject the
+    whole message with a 400, which then bounces through error_handler
+    and a retry. Escape once per request and reuse the result.
+    """
+    return escape_markdown(str(text))
+
+
+def _md_code(text) -> str:
+    """Sanitize text for an inline Markdown code span
+
+    Backticks cannot be escaped inside a code entity, so they are
+    substituted instead of escaped.
+    """
+    return str(text).replace('`', "'")
+
 HELP_TEXT = """
 🧮 *Math Animation Bot* 🎬
 
@@ -103,18 +141,11 @@ If you find this useful, consider donating:
 /donate
 """
 
+# Rendered once at import: these interpolate only module constants, so
+# rebuilding them per command was pure allocation churn
+ABOUT_RENDERED = ABOUT_TEXT.format(source_url=SOURCE_CODE_URL)
 
-class MathBot:
-    """Telegram bot for math animations"""
-    
-    def __init__(self, token: str):
-        self.token = token
-        self.pipeline = MathAnimationPipeline(quiet=True)
-        self.app = None
-    
-    async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /start command"""
-        welcome_text = """
+WELCOME_TEXT = """
 👋 *Welcome to Math Animation Bot!*
 
 I can help you solve equations step-by-step and create beautiful animations.
@@ -123,36 +154,8 @@ Try: `/solve 5x+3=0`
 
 For more info, use /help
 """
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("📖 Help", callback_data='help'),
-                InlineKeyboardButton("💝 Donate", callback_data='donate')
-            ],
-            [
-                InlineKeyboardButton("💻 Source Code", url=SOURCE_CODE_URL)
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await update.message.reply_text(
-            welcome_text,
-            parse_mode='Markdown',
-            reply_markup=reply_markup
-        )
-    
-    async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /help command"""
-        await update.message.reply_text(HELP_TEXT, parse_mode='Markdown')
-    
-    async def about_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /about command"""
-        about = ABOUT_TEXT.format(source_url=SOURCE_CODE_URL)
-        await update.message.reply_text(about, parse_mode='Markdown')
-    
-    async def donate_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /donate command"""
-        donate_text = f"""
+
+DONATE_TEXT = f"""
 💝 *Support This Project*
 
 If you find this bot useful, consider supporting its development:
@@ -173,21 +176,8 @@ Your support helps keep this project free and open source! 🙏
 🔄 Share with friends
 🐛 Report bugs and suggest features
 """
-        
-        keyboard = [
-            [InlineKeyboardButton("💻 View Source Code", url=SOURCE_CODE_URL)]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await update.message.reply_text(
-            donate_text,
-            parse_mode='Markdown',
-            reply_markup=reply_markup
-        )
-    
-    async def source_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /source command"""
-        source_text = f"""
+
+SOURCE_TEXT = f"""
 💻 *Source Code*
 
 This bot is fully open source!
@@ -209,17 +199,218 @@ This bot is fully open source!
 
 Feel free to contribute, report issues, or fork the project!
 """
-        
-        keyboard = [
-            [InlineKeyboardButton("📖 View on GitHub", url=SOURCE_CODE_URL)],
-            [InlineKeyboardButton("💝 Donate", callback_data='donate')]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
+
+
+# The keyboards never change between requests, so build the markup
+# objects once at import instead of per command
+START_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("📖 Help", callback_data='help'),
+        InlineKeyboardButton("💝 Donate", callback_data='donate')
+    ],
+    [
+        InlineKeyboardButton("💻 Source Code", url=SOURCE_CODE_URL)
+    ]
+])
+
+DONATE_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("💻 View Source Code", url=SOURCE_CODE_URL)]
+])
+
+SOURCE_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📖 View on GitHub", url=SOURCE_CODE_URL)],
+    [InlineKeyboardButton("💝 Donate", callback_data='donate')]
+])
+
+
+class MathBot:
+    """Telegram bot for math animations"""
+
+    # Entries kept in the per-bot solve cache before LRU eviction
+    _SOLVE_CACHE_SIZE = 1024
+
+    # Upper bound on the on-disk video cache before LRU eviction kicks in
+    _VIDEO_CACHE_BYTES = 500 * 1024 * 1024
+
+    def __init__(self, token: str):
+        self.token = token
+        self.pipeline = MathAnimationPipeline(quiet=True)
+        self.app = None
+        # Bounded LRU of solve results keyed on the normalized equation;
+        # the common /solve-then-/animate pair hits it on the second call
+        self._solve_cache: OrderedDict = OrderedDict()
+        # Blocking pipeline work runs off the event loop: solves share a
+        # small thread pool, renders get a single worker so only one
+        # Manim subprocess runs at a time while other updates proceed
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        self._render_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        # Finished renders are copied here keyed on the equation hash, so
+        # a repeated /animate serves the file instead of re-rendering
+        self._video_cache_dir = _SCRIPT_DIR / "media" / "cache"
+        self._video_cache_lock = threading.Lock()
+        # Futures for work currently running, keyed on
+        # (chat_id, command, equation); burst duplicates await these
+        # instead of spawning their own pipeline run
+        self._inflight: dict = {}
+        # Per-user token buckets of (tokens, last_refill) gating the
+        # expensive render path
+        self._buckets: dict = {}
+
+    def _cached_process(self, equation: str) -> dict:
+        """process_equation with a bounded LRU over normalized inputs
+
+        Normalization strips whitespace only: case matters, since
+        mathsteps treats X and x as distinct variables.
+        """
+        key = equation.strip().replace(' ', '')
+        cached = self._solve_cache.get(key)
+        if cached is not None:
+            self._solve_cache.move_to_end(key)
+            return cached
+
+        result = self.pipeline.process_equation(equation, verbose=False)
+        if result.get('success'):
+            self._solve_cache[key] = result
+            if len(self._solve_cache) > self._SOLVE_CACHE_SIZE:
+                self._solve_cache.popitem(last=False)
+        return result
+
+    def _allow(self, uid: int, rate: float = 0.2, burst: int = 2) -> bool:
+        """Token-bucket check for one user's render requests
+
+        Tokens refill at `rate` per second up to `burst`; each allowed
+        request spends one. A single user hammering /animate therefore
+        cannot monopolize the render worker for everyone else.
+        """
+        now = time.monotonic()
+        tokens, last = self._buckets.get(uid, (float(burst), now))
+        tokens = min(float(burst), tokens + (now - last) * rate)
+        ok = tokens >= 1
+        self._buckets[uid] = (tokens - 1 if ok else tokens, now)
+        return ok
+
+    async def _deduped(self, key: tuple, factory):
+        """Run factory once per key; concurrent duplicates share the result
+
+        An impatient user firing the same command several times within
+        one poll cycle would otherwise start that many identical
+        pipeline runs. The first caller does the work; the rest await
+        the same future. The key is removed once the work settles so a
+        later retry runs fresh.
+        """
+        fut = self._inflight.get(key)
+        if fut is not None:
+            return await fut
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result = await factory()
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved even with no duplicate waiting
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    @staticmethod
+    def _video_cache_key(equation: str) -> str:
+        return hashlib.sha256(equation.strip().encode()).hexdigest()[:16]
+
+    def _load_video_index(self) -> dict:
+        """Read the {key: last_used_ts} sidecar for the video cache"""
+        try:
+            with open(self._video_cache_dir / "cache_index.json") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_video_index(self, index: dict):
+        with open(self._video_cache_dir / "cache_index.json", 'w') as f:
+            json.dump(index, f)
+
+    def _cached_video(self, equation: str) -> Optional[Path]:
+        """Return the cached render for an equation, bumping its LRU slot"""
+        key = self._video_cache_key(equation)
+        path = self._video_cache_dir / f"{key}.mp4"
+        if not path.exists():
+            return None
+        with self._video_cache_lock:
+            index = self._load_video_index()
+            index[key] = time.time()
+            self._save_video_index(index)
+        return path
+
+    def _store_video(self, equation: str, video: Path):
+        """Copy a fresh render into the cache, evicting the oldest entries
+
+        Eviction keeps the cache under _VIDEO_CACHE_BYTES, dropping the
+        least recently served videos first. Cache failures only cost the
+        next identical request a re-render, so they are logged, not raised.
+        """
+        try:
+            self._video_cache_dir.mkdir(parents=True, exist_ok=True)
+            key = self._video_cache_key(equation)
+            shutil.copy(video, self._video_cache_dir / f"{key}.mp4")
+            with self._video_cache_lock:
+                index = self._load_video_index()
+                index[key] = time.time()
+
+                entries = []
+                total = 0
+                for k in list(index):
+                    try:
+                        size = (self._video_cache_dir / f"{k}.mp4").stat().st_size
+                    except OSError:
+                        del index[k]  # file vanished; drop the stale entry
+                        continue
+                    entries.append((index[k], k, size))
+                    total += size
+
+                entries.sort()
+                for _, k, size in entries:
+                    if total <= self._VIDEO_CACHE_BYTES:
+                        break
+                    (self._video_cache_dir / f"{k}.mp4").unlink(missing_ok=True)
+                    del index[k]
+                    total -= size
+
+                self._save_video_index(index)
+        except OSError as e:
+            logger.warning("Could not cache video: %s", e)
+
+    async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /start command"""
+        await update.message.reply_text(
+            WELCOME_TEXT,
+            parse_mode='Markdown',
+            reply_markup=START_KEYBOARD
+        )
+    
+    async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /help command"""
+        await update.message.reply_text(HELP_TEXT, parse_mode='Markdown')
+    
+    async def about_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /about command"""
+        await update.message.reply_text(ABOUT_RENDERED, parse_mode='Markdown')
+    
+    async def donate_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /donate command"""
         await update.message.reply_text(
-            source_text,
+            DONATE_TEXT,
             parse_mode='Markdown',
-            reply_markup=reply_markup
+            reply_markup=DONATE_KEYBOARD
+        )
+    
+    async def source_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /source command"""
+        await update.message.reply_text(
+            SOURCE_TEXT,
+            parse_mode='Markdown',
+            reply_markup=SOURCE_KEYBOARD
         )
     
     async def solve_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -233,51 +424,83 @@ Feel free to contribute, report issues, or fork the project!
             return
         
         equation = ' '.join(context.args)
-        
+        eq_code = _md_code(equation)  # escaped once, reused in every reply
+
         # Send processing message
         processing_msg = await update.message.reply_text(
-            f"🔄 Solving: `{equation}`\n\nPlease wait...",
+            f"🔄 Solving: `{eq_code}`\n\nPlease wait...",
             parse_mode='Markdown'
         )
         
         try:
-            # Process equation
-            result = self.pipeline.process_equation(equation, verbose=False)
-            
+            # Process equation (in a worker thread; the solve blocks on
+            # the Node round-trip). Identical in-flight solves — and the
+            # validity check of a concurrent /animate — share one run.
+            loop = asyncio.get_running_loop()
+            result = await self._deduped(
+                (update.effective_chat.id, 'solve', equation),
+                lambda: loop.run_in_executor(self.executor, self._cached_process, equation),
+            )
+
             if not result.get('success'):
-                error_msg = f"❌ *Error:* {result.get('error')}\n\n"
+                parts = [f"❌ *Error:* {_md_escape(result.get('error'))}\n\n"]
                 if result.get('suggestion'):
-                    error_msg += f"💡 *Suggestion:* {result.get('suggestion')}"
-                
-                await processing_msg.edit_text(error_msg, parse_mode='Markdown')
+                    parts.append(f"💡 *Suggestion:* {_md_escape(result.get('suggestion'))}")
+
+                await processing_msg.edit_text(''.join(parts), parse_mode='Markdown')
                 return
-            
-            # Format solution
-            solution_text = f"✅ *Solved:* `{equation}`\n\n"
-            solution_text += f"*Type:* {result.get('type')}\n"
-            solution_text += f"*Steps:* {result.get('stepCount')}\n\n"
-            
+
+            # Format solution as a fragment list; one join at the end
+            # instead of quadratic += concatenation across the steps
+            steps = result.get('steps', [])
+            parts = [
+                f"✅ *Solved:* `{eq_code}`\n\n",
+                f"*Type:* {result.get('type')}\n",
+                f"*Steps:* {result.get('stepCount')}\n\n",
+            ]
+
             # Add steps
-            for step in result.get('steps', [])[:10]:  # Limit to 10 steps for Telegram
-                solution_text += f"*Step {step['step']}:* {step['description']}\n"
-                solution_text += f"`{step['before']}`\n"
-                solution_text += f"↓\n"
-                solution_text += f"`{step['after']}`\n\n"
-            
-            if len(result.get('steps', [])) > 10:
-                solution_text += f"... and {len(result.get('steps', [])) - 10} more steps\n\n"
-            
-            solution_text += "Use `/animate {equation}` to create a video!"
-            
-            await processing_msg.edit_text(solution_text, parse_mode='Markdown')
+            for step in steps[:10]:  # Limit to 10 steps for Telegram
+                parts.append(
+                    f"*Step {step.step}:* {_md_escape(step.description)}\n"
+                    f"`{_md_code(step.before)}`\n↓\n`{_md_code(step.after)}`\n\n"
+                )
+
+            if len(steps) > 10:
+                parts.append(f"... and {len(steps) - 10} more steps\n\n")
+
+            parts.append("Use `/animate {equation}` to create a video!")
+
+            await processing_msg.edit_text(''.join(parts), parse_mode='Markdown')
             
         except Exception as e:
-            logger.error(f"Error solving equation: {e}")
+            logger.error("Error solving equation: %s", e)
             await processing_msg.edit_text(
                 f"❌ An error occurred: {str(e)}\n\n"
                 "Please try again or use /help for examples."
             )
     
+    def _find_latest_video(self) -> Optional[Path]:
+        """Locate the newest rendered mp4 under the media tree
+
+        Uses scandir so the mtimes come from the directory entries the
+        kernel already returned, instead of a fresh stat() per path the
+        glob approach needed.
+        """
+        try:
+            with os.scandir(MEDIA_DIR) as it:
+                dirs = [e for e in it if e.is_dir(follow_symlinks=False)]
+        except FileNotFoundError:
+            return None
+        if not dirs:
+            return None
+        latest_dir = max(dirs, key=lambda e: e.stat().st_mtime)
+        with os.scandir(latest_dir.path) as it:
+            videos = [e for e in it if e.name.endswith('.mp4') and e.is_file()]
+        if not videos:
+            return None
+        return Path(max(videos, key=lambda e: e.stat().st_mtime).path)
+
     async def animate_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /animate command"""
         if not context.args:
@@ -288,63 +511,106 @@ Feel free to contribute, report issues, or fork the project!
             )
             return
         
+        if not self._allow(update.effective_user.id):
+            await update.message.reply_text(
+                "⏳ Please wait before requesting another animation."
+            )
+            return
+
         equation = ' '.join(context.args)
-        
+        eq_code = _md_code(equation)  # escaped once, reused in every reply
+
         # Send processing message
         processing_msg = await update.message.reply_text(
-            f"🎬 Creating animation for: `{equation}`\n\n"
+            f"🎬 Creating animation for: `{eq_code}`\n\n"
             "⏳ This may take 30-60 seconds...\n"
             "Please be patient!",
             parse_mode='Markdown'
         )
         
         try:
-            # Verify equation is valid first
-            result = self.pipeline.process_equation(equation, verbose=False)
-            
+            # Verify equation is valid first (off the event loop)
+            loop = asyncio.get_running_loop()
+            result = await self._deduped(
+                (update.effective_chat.id, 'solve', equation),
+                lambda: loop.run_in_executor(self.executor, self._cached_process, equation),
+            )
+
             if not result.get('success'):
-                error_msg = f"❌ Cannot create animation:\n{result.get('error')}\n\n"
+                error_msg = f"❌ Cannot create animation:\n{_md_escape(result.get('error'))}\n\n"
                 if result.get('suggestion'):
-                    error_msg += f"💡 {result.get('suggestion')}"
+                    error_msg += f"💡 {_md_escape(result.get('suggestion'))}"
                 
                 await processing_msg.edit_text(error_msg, parse_mode='Markdown')
                 return
-            
-            # Create animation
-            success = self.pipeline.run_animation(
-                equation,
-                quality='l',  # Low quality for faster rendering
-                preview=False
+
+            # Rendering is by far the most expensive step, so serve a
+            # previously rendered video for the same equation straight
+            # from the on-disk cache
+            cached = await loop.run_in_executor(self.executor, self._cached_video, equation)
+            if cached:
+                await update.message.reply_video(
+                    video=cached,
+                    caption=f"🎬 Animation for: `{eq_code}`\n\n"
+                           f"Steps: {result.get('stepCount')}",
+                    parse_mode='Markdown',
+                    read_timeout=120,
+                    write_timeout=120
+                )
+                await processing_msg.delete()
+                return
+
+            # Create animation; the render blocks for tens of seconds,
+            # so it runs on the dedicated single render worker. The
+            # in-process API keeps manim imported between renders and
+            # falls back to the CLI subprocess on failure.
+            video_path = await self._deduped(
+                (update.effective_chat.id, 'animate', equation),
+                lambda: loop.run_in_executor(
+                    self._render_executor,
+                    partial(
+                        self.pipeline.render_inprocess,
+                        equation,
+                        quality='l',  # Low quality for faster rendering
+                    )
+                ),
             )
             
-            if success:
-                # Find the video file
-                media_dir = Path(__file__).parent / "media" / "videos" / "enhanced_animator"
-                video_dirs = list(media_dir.glob("*"))
-                
-                if video_dirs:
-                    latest_dir = max(video_dirs, key=lambda p: p.stat().st_mtime)
-                    videos = list(latest_dir.glob("*.mp4"))
-                    
-                    if videos:
-                        latest_video = max(videos, key=lambda p: p.stat().st_mtime)
-                        
-                        # Send video
+            if video_path:
+                # run_animation returns the rendered file's path; only
+                # fall back to scanning the media tree if it could not
+                # locate its own output
+                if isinstance(video_path, Path):
+                    latest_video = video_path
+                else:
+                    latest_video = self._find_latest_video()
+
+                if latest_video:
+                    # Only announce the upload when it will actually
+                    # take a while; small files save the extra edit
+                    if latest_video.stat().st_size > 5 * 1024 * 1024:
                         await processing_msg.edit_text(
                             "📤 Uploading video...",
                             parse_mode='Markdown'
                         )
-                        
-                        with open(latest_video, 'rb') as video_file:
-                            await update.message.reply_video(
-                                video=video_file,
-                                caption=f"🎬 Animation for: `{equation}`\n\n"
-                                       f"Steps: {result.get('stepCount')}",
-                                parse_mode='Markdown'
-                            )
-                        
-                        await processing_msg.delete()
-                        return
+
+                    # Pass the path so the library streams the file
+                    # through its async client instead of blocking
+                    # the event loop reading the whole mp4
+                    await update.message.reply_video(
+                        video=latest_video,
+                        caption=f"🎬 Animation for: `{eq_code}`\n\n"
+                               f"Steps: {result.get('stepCount')}",
+                        parse_mode='Markdown',
+                        read_timeout=120,
+                        write_timeout=120
+                    )
+
+                    await loop.run_in_executor(
+                        self.executor, self._store_video, equation, latest_video
+                    )
+                    await processing_msg.delete()
+                    return
             
             # If we get here, something went wrong
             await processing_msg.edit_text(
@@ -353,7 +619,7 @@ Feel free to contribute, report issues, or fork the project!
             )
             
         except Exception as e:
-            logger.error(f"Error creating animation: {e}")
+            logger.error("Error creating animation: %s", e)
             await processing_msg.edit_text(
                 f"❌ An error occurred during animation:\n{str(e)}\n\n"
                 "Try using `/solve {equation}` for text solution."
@@ -364,12 +630,13 @@ Feel free to contribute, report issues, or fork the project!
         text = update.message.text.strip()
         
         # If message looks like an equation, solve it
-        if any(char in text for char in ['=', 'x', 'X']) or 'sqrt' in text.lower():
+        if EQUATION_HINT_RE.search(text):
+            text_code = _md_code(text)
             await update.message.reply_text(
                 f"💡 Did you want to solve this?\n"
-                f"Use: `/solve {text}`\n\n"
+                f"Use: `/solve {text_code}`\n\n"
                 f"Or create animation:\n"
-                f"`/animate {text}`",
+                f"`/animate {text_code}`",
                 parse_mode='Markdown'
             )
         else:
@@ -392,7 +659,12 @@ Feel free to contribute, report issues, or fork the project!
     
     async def error_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle errors"""
-        logger.error(f"Update {update} caused error {context.error}")
+        # repr() of a full Update walks the whole nested object; log just
+        # the id at ERROR and keep the complete dump behind DEBUG
+        logger.error("Update %s caused error %s",
+                     getattr(update, 'update_id', None), context.error)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Full update: %s", update)
         
         if update and update.message:
             await update.message.reply_text(
@@ -402,17 +674,24 @@ Feel free to contribute, report issues, or fork the project!
     
     def run(self):
         """Run the bot"""
-        # Create application
-        self.app = Application.builder().token(self.token).build()
-        
-        # Add handlers
+        # Create application; concurrent_updates lets each update run in
+        # its own task instead of serial dispatch
+        self.app = (
+            Application.builder()
+            .token(self.token)
+            .concurrent_updates(True)
+            .build()
+        )
+
+        # Add handlers; the slow commands are non-blocking so a long
+        # render never holds up the update queue
         self.app.add_handler(CommandHandler("start", self.start_command))
         self.app.add_handler(CommandHandler("help", self.help_command))
         self.app.add_handler(CommandHandler("about", self.about_command))
         self.app.add_handler(CommandHandler("donate", self.donate_command))
         self.app.add_handler(CommandHandler("source", self.source_command))
-        self.app.add_handler(CommandHandler("solve", self.solve_command))
-        self.app.add_handler(CommandHandler("animate", self.animate_command))
+        self.app.add_handler(CommandHandler("solve", self.solve_command, block=False))
+        self.app.add_handler(CommandHandler("animate", self.animate_command, block=False))
         self.app.add_handler(CallbackQueryHandler(self.button_callback))
         self.app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
         
@@ -421,10 +700,21 @@ Feel free to contribute, report issues, or fork the project!
         
         # Start bot
         logger.info("🤖 Bot is starting...")
-        logger.info(f"🔗 Bot username will be displayed after first message")
+        logger.info("🔗 Bot username will be displayed after first message")
         logger.info("Press Ctrl+C to stop")
-        
-        self.app.run_polling(allowed_updates=Update.ALL_TYPES)
+
+        try:
+            # Long-poll getUpdates: far fewer requests than short polling
+            # at the same delivery latency
+            self.app.run_polling(
+                allowed_updates=Update.ALL_TYPES,
+                poll_interval=0.0,
+                timeout=30,
+                drop_pending_updates=True,
+            )
+        finally:
+            self.executor.shutdown(wait=False)
+            self._render_executor.shutdown(wait=False)
 
 
 def main():